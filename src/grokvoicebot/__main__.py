@@ -1,8 +1,9 @@
 from .db import init_db
-from .services import seed_knowledge
+from .services import refresh_knowledge_snippets, seed_knowledge
 
 
 if __name__ == "__main__":
     init_db()
     seed_knowledge()
+    refresh_knowledge_snippets()
     print("Database initialized and seeded.")
@@ -1,10 +1,21 @@
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+import json
+import math
 
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .archive import archive_resolved_tickets
 from .assistant import handle_assistant_utterance
-from .db import init_db
+from .changefeed import get_change_feed
+from .config import get_settings
+from .db import get_engine
+from .prefetch import get_prefetcher
+from .ratelimit import DEFAULT_LANE, VOICE_LANE, get_admission
 from .schemas import (
     AssistantUtteranceInput,
     KnowledgeCreateInput,
@@ -12,25 +23,74 @@ from .schemas import (
     TicketCreateInput,
     TicketStatusInput,
     TicketUpdateInput,
+    TranscriptPrefetchInput,
 )
+from .serve import bootstrap, is_bootstrapped
 from .services import (
     create_knowledge_article,
     seed_dummy_data,
     create_ticket,
     get_ticket_details,
     get_ticket_status,
+    latest_change_cursor,
+    list_ticket_changes,
     search_knowledge,
-    seed_knowledge,
     update_ticket,
 )
 
 app = FastAPI(title="Grok ITSD Voicebot Service")
 
+UNLIMITED_PATHS = {"/health", "/ready"}
+VOICE_PATHS = {"/assistant/respond"}
+PREFETCH_PATH = "/assistant/prefetch"
+
+
+def _too_many_requests(detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _prefetch_ignored(settings) -> bool:
+    # Speculations live in the worker that received them; with several workers the final
+    # /assistant/respond usually lands elsewhere, so the work would mostly be wasted.
+    return not settings.prefetch_enabled or settings.serve_workers > 1
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    settings = get_settings()
+    if not settings.rate_limit_enabled or request.url.path in UNLIMITED_PATHS:
+        return await call_next(request)
+    if request.url.path == PREFETCH_PATH and _prefetch_ignored(settings):
+        # Ignored prefetches do no work, so they spend neither a token nor a slot.
+        return await call_next(request)
+
+    admission = get_admission()
+    client = request.client.host if request.client else "unknown"
+    if request.url.path == PREFETCH_PATH:
+        retry_after = admission.check_prefetch(client)
+    else:
+        retry_after = admission.check_client(client)
+    if retry_after:
+        return _too_many_requests("Rate limit exceeded", retry_after)
+
+    lane = VOICE_LANE if request.url.path in VOICE_PATHS else DEFAULT_LANE
+    if not admission.acquire(lane):
+        return _too_many_requests("Server busy", 1)
+    try:
+        return await call_next(request)
+    finally:
+        admission.release()
+
 
 @app.on_event("startup")
 def startup() -> None:
-    init_db()
-    seed_knowledge()
+    if not is_bootstrapped():
+        bootstrap()
+    app.state.ready = True
 
 
 @app.get("/health")
@@ -38,6 +98,25 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(response: Response) -> dict[str, str]:
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+        return {"status": "starting"}
+    try:
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        response.status_code = 503
+        return {"status": "database unavailable"}
+    return {"status": "ready"}
+
+
+@app.get("/metrics/admission")
+def metrics_admission() -> dict:
+    return get_admission().stats()
+
+
 @app.post("/knowledge/search")
 def knowledge_search(payload: KnowledgeSearchInput) -> dict:
     return search_knowledge(payload.query)
@@ -68,14 +147,92 @@ def tickets_update(payload: TicketUpdateInput) -> dict:
     return update_ticket(**payload.model_dump())
 
 
+@app.get("/tickets/changes")
+def tickets_changes(
+    cursor: int = Query(0, ge=0),
+    ticket_ref: str | None = None,
+    assigned_group: str | None = None,
+    status: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
+) -> dict:
+    return list_ticket_changes(cursor, ticket_ref, assigned_group, status, limit)
+
+
+def _change_filter(ticket_ref: str | None, assigned_group: str | None, status: str | None):
+    def matches(change: dict) -> bool:
+        if ticket_ref and ticket_ref not in (change["ticket_number"], str(change["ticket_id"])):
+            return False
+        if assigned_group and change["assigned_group"] != assigned_group:
+            return False
+        return not status or change["status"] == status
+
+    return matches
+
+
+@app.get("/tickets/changes/stream")
+async def tickets_changes_stream(
+    request: Request,
+    cursor: int | None = Query(None, ge=0),
+    ticket_ref: str | None = None,
+    assigned_group: str | None = None,
+    status: str | None = None,
+) -> Response:
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        cursor = int(last_event_id)
+    if cursor is None:
+        cursor = await run_in_threadpool(latest_change_cursor)
+    settings = get_settings()
+    feed = get_change_feed()
+    # Streams outlive the admission middleware's slot, so they are capped separately (per worker).
+    if not feed.reserve(max(1, settings.change_feed_max_streams // max(1, settings.serve_workers))):
+        return _too_many_requests("Too many open change streams", 5)
+
+    matches = _change_filter(ticket_ref, assigned_group, status)
+
+    async def events():
+        try:
+            async for change in feed.stream(cursor, matches, settings.change_feed_keepalive):
+                if await request.is_disconnected():
+                    return
+                if change is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"id: {change['cursor']}\nevent: ticket_update\ndata: {json.dumps(change)}\n\n"
+        finally:
+            feed.release()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @app.post("/seed/dummy")
 def seed_dummy() -> dict:
     return seed_dummy_data()
 
 
+@app.post("/admin/archive")
+def admin_archive(
+    older_than_days: int | None = Query(None, ge=0),
+    batch_size: int | None = Query(None, ge=1),
+) -> dict:
+    return archive_resolved_tickets(older_than_days, batch_size)
+
+
 @app.post("/assistant/respond")
 def assistant_respond(payload: AssistantUtteranceInput) -> dict:
-    return handle_assistant_utterance(payload.utterance)
+    return handle_assistant_utterance(payload.utterance, payload.session_id)
+
+
+@app.post("/assistant/prefetch")
+def assistant_prefetch(payload: TranscriptPrefetchInput) -> dict:
+    if _prefetch_ignored(get_settings()):
+        return {"accepted": False, "disabled": True}
+    return {"accepted": get_prefetcher().observe(payload.session_id, payload.transcript)}
+
+
+@app.get("/metrics/prefetch")
+def metrics_prefetch() -> dict:
+    return get_prefetcher().stats()
 
 
 @app.get("/", include_in_schema=False)
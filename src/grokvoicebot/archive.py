@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import re
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import selectinload
+
+from .config import get_settings
+from .db import ArchivedTicket, ArchivedTicketUpdate, SessionLocal, Ticket, TicketUpdate
+
+
+ARCHIVABLE_STATUSES = ("resolved", "closed")
+
+# Today's ticket numbers are generated by scanning the hot table only, so tickets must
+# be at least a day old before they can leave it.
+MIN_ARCHIVE_AGE_DAYS = 1
+
+
+def _copy(row, model, **extra):
+    values = {c.name: getattr(row, c.name) for c in row.__table__.columns if c.name in model.__table__.columns}
+    return model(**values, **extra)
+
+
+def _archivable(cutoff: datetime):
+    # Databases created before sqlite_autoincrement hand out max(id) + 1, so archiving the
+    # newest ticket or update would let its id be reused. Holding those rows back keeps ids
+    # monotonic for every backend. Rows whose id was already reused are skipped as well,
+    # since their archived twin would collide.
+    newest_ticket = select(func.max(Ticket.id)).scalar_subquery()
+    newest_update = select(func.max(TicketUpdate.id)).scalar_subquery()
+    return (
+        select(Ticket)
+        .where(Ticket.status.in_(ARCHIVABLE_STATUSES), Ticket.updated_at < cutoff)
+        .where(Ticket.id != newest_ticket)
+        .where(~Ticket.updates.any(TicketUpdate.id == newest_update))
+        .where(~exists().where(ArchivedTicket.id == Ticket.id))
+        .where(~Ticket.updates.any(TicketUpdate.id.in_(select(ArchivedTicketUpdate.id))))
+    )
+
+
+def archive_resolved_tickets(older_than_days: int | None = None, batch_size: int | None = None) -> dict:
+    """Move resolved tickets untouched for `older_than_days` into the archive tables, in batches."""
+    settings = get_settings()
+    days = max(MIN_ARCHIVE_AGE_DAYS, older_than_days if older_than_days is not None else settings.archive_after_days)
+    if batch_size is None:
+        batch_size = settings.archive_batch_size
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    archived = 0
+    while True:
+        with SessionLocal() as session:
+            tickets = session.scalars(
+                _archivable(cutoff)
+                .options(selectinload(Ticket.updates))
+                .order_by(Ticket.id)
+                .limit(batch_size)
+            ).all()
+            if not tickets:
+                break
+            for ticket in tickets:
+                copy = _copy(ticket, ArchivedTicket)
+                copy.updates = [_copy(u, ArchivedTicketUpdate) for u in ticket.updates]
+                session.add(copy)
+                session.delete(ticket)
+            session.commit()
+            archived += len(tickets)
+
+    return {"archived": archived, "cutoff": cutoff.isoformat()}
+
+
+def find_archived_ticket(session, ticket_ref: str) -> ArchivedTicket | None:
+    if re.fullmatch(r"\d+", ticket_ref):
+        return session.get(ArchivedTicket, int(ticket_ref))
+    return session.scalar(select(ArchivedTicket).where(ArchivedTicket.ticket_number == ticket_ref))
+
+
+def restore_ticket(session, archived: ArchivedTicket) -> Ticket:
+    """Move an archived ticket back into the hot tables, keeping its number and, when free, its id."""
+    ticket = _copy(archived, Ticket)
+    if session.get(Ticket, archived.id) is not None:
+        ticket.id = None
+    taken = set(
+        session.scalars(select(TicketUpdate.id).where(TicketUpdate.id.in_([u.id for u in archived.updates])))
+    )
+    ticket.updates = [_copy(u, TicketUpdate) for u in archived.updates]
+    for update in ticket.updates:
+        update.ticket_id = None
+        if update.id in taken:
+            update.id = None
+    session.delete(archived)
+    session.flush()
+    session.add(ticket)
+    session.flush()
+    return ticket
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Archive resolved tickets.")
+    parser.add_argument("--older-than-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    print(archive_resolved_tickets(args.older_than_days, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import re
 
+from .config import get_settings
+from .prefetch import get_prefetcher
 from .services import create_ticket, get_ticket_details, get_ticket_status, search_knowledge, update_ticket
 
 
@@ -11,6 +13,9 @@ DEFAULT_REQUESTER = {
 }
 
 
+SPOKEN_STEP_COUNT = 3
+
+
 TICKET_REF_RE = re.compile(r"(itsd-\d{8}-\d{4}|\d+)", re.IGNORECASE)
 
 
@@ -26,10 +31,23 @@ def _format_knowledge(matches: list[dict]) -> str:
     if not matches:
         return "I could not find a matching knowledge article. Please rephrase the issue."
     top = matches[0]
-    return f"I found '{top['title']}'. Suggested guidance: {top['content']}"
-
-
-def handle_assistant_utterance(utterance: str) -> dict:
+    summary = top.get("spoken_summary") or ""
+    # Short articles often state every step in the summary sentence already.
+    folded_summary = summary.casefold()
+    steps = [step for step in top.get("spoken_steps") or [] if step.casefold() not in folded_summary]
+    if not summary and not steps:
+        return f"I found '{top['title']}'. Suggested guidance: {top['content']}"
+
+    parts = [summary] if summary else []
+    if steps:
+        parts.append("Steps: " + "; ".join(steps[:SPOKEN_STEP_COUNT]) + ".")
+        if len(steps) > SPOKEN_STEP_COUNT:
+            remaining = len(steps) - SPOKEN_STEP_COUNT
+            parts.append(f"The article has {remaining} more step{'s' if remaining > 1 else ''}.")
+    return f"I found '{top['title']}'. Suggested guidance: {' '.join(parts)}"
+
+
+def handle_assistant_utterance(utterance: str, session_id: str | None = None) -> dict:
     text = utterance.strip()
     lowered = text.lower()
 
@@ -94,7 +112,11 @@ def handle_assistant_utterance(utterance: str) -> dict:
             "response": f"Ticket {result['ticket_number']} created with {result['priority']} priority.",
         }
 
-    result = search_knowledge(text)
+    result = None
+    if session_id and get_settings().prefetch_enabled:
+        result = get_prefetcher().lookup(session_id, text)
+    if result is None:
+        result = search_knowledge(text)
     return {
         "action": "knowledge_search",
         "result": result,
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+import logging
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .db import TicketUpdate
+from .services import latest_change_cursor, list_ticket_changes
+
+logger = logging.getLogger(__name__)
+
+POLL_BATCH_SIZE = 500
+
+
+class ChangeNotifier:
+    """Wakes change-feed subscribers in this process when a ticket update is committed.
+
+    Updates committed by other processes (workers, the voice agent) are picked up by the
+    change feed's poll interval instead.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Event:
+        waiter = asyncio.Event()
+        with self._lock:
+            self._waiters.add((asyncio.get_running_loop(), waiter))
+        return waiter
+
+    def unsubscribe(self, waiter: asyncio.Event) -> None:
+        with self._lock:
+            self._waiters = {(loop, w) for loop, w in self._waiters if w is not waiter}
+
+    def notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(waiter.set)
+
+
+notifier = ChangeNotifier()
+
+_PENDING_KEY = "ticket_updates_inserted"
+
+
+@event.listens_for(TicketUpdate, "after_insert")
+def _mark_ticket_update(mapper, connection, target: TicketUpdate) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        notifier.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class ChangeFeed:
+    """One poller per process that reads new ticket updates and fans them out to subscribers.
+
+    Recent changes are kept in a bounded buffer. Subscribers whose cursor is older than the
+    buffer catch up from the database first, then follow the buffer.
+    """
+
+    def __init__(self, poll_interval: float, buffer_size: int) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.poll_interval = poll_interval
+        self.cursor = 0
+        self.subscribers = 0
+        self._floor = 0
+        self._buffer: deque[dict] = deque(maxlen=buffer_size)
+        self._published = asyncio.Event()
+        self._has_subscribers = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+
+    async def _start(self) -> None:
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        ready = asyncio.create_task(self._ready.wait())
+        await asyncio.wait({ready, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not self._ready.is_set():
+            ready.cancel()
+            self._task.result()  # re-raise why the poller died before it was ready
+
+    async def _run(self) -> None:
+        waiter = notifier.subscribe()
+        try:
+            self.cursor = self._floor = await run_in_threadpool(latest_change_cursor)
+            self._buffer.clear()
+            self._ready.set()
+            while True:
+                await self._has_subscribers.wait()
+                waiter.clear()
+                try:
+                    await self._poll()
+                except Exception:
+                    logger.exception("Change feed poll failed")
+                try:
+                    await asyncio.wait_for(waiter.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            notifier.unsubscribe(waiter)
+
+    async def _poll(self) -> None:
+        published = False
+        while True:
+            result = await run_in_threadpool(list_ticket_changes, self.cursor, limit=POLL_BATCH_SIZE)
+            for change in result["changes"]:
+                if len(self._buffer) == self._buffer.maxlen:
+                    self._floor = self._buffer[0]["cursor"]
+                self._buffer.append(change)
+            self.cursor = result["cursor"]
+            published = published or bool(result["changes"])
+            if len(result["changes"]) < POLL_BATCH_SIZE:
+                break
+        if published:
+            self._published.set()
+            self._published = asyncio.Event()
+
+    def reserve(self, limit: int) -> bool:
+        """Claim a stream slot; release it with `release()` when the stream ends."""
+        if self.subscribers >= limit:
+            return False
+        self.subscribers += 1
+        self._has_subscribers.set()
+        return True
+
+    def release(self) -> None:
+        self.subscribers -= 1
+        if not self.subscribers:
+            self._has_subscribers.clear()
+
+    async def stream(
+        self, position: int, matches: Callable[[dict], bool], keepalive: float
+    ) -> AsyncIterator[dict | None]:
+        """Yield matching changes after `position`, or None when a keepalive is due."""
+        await self._start()
+        while True:
+            published = self._published
+            if position < self._floor:
+                result = await run_in_threadpool(list_ticket_changes, position, limit=POLL_BATCH_SIZE)
+                for change in result["changes"]:
+                    if matches(change):
+                        yield change
+                position = result["cursor"]
+                if result["changes"]:
+                    continue
+                # Nothing left in the database before the buffer; follow the buffer from here.
+                position = self._floor
+            # Walk a snapshot and advance only over what it contained: yielding suspends this
+            # generator, and rows the poller appends meanwhile are picked up on the next pass.
+            for change in list(self._buffer):
+                if change["cursor"] <= position:
+                    continue
+                position = change["cursor"]
+                if matches(change):
+                    yield change
+            try:
+                await asyncio.wait_for(published.wait(), keepalive)
+            except asyncio.TimeoutError:
+                yield None
+
+
+_feed: ChangeFeed | None = None
+
+
+def get_change_feed() -> ChangeFeed:
+    """Return this process's feed; must be called from the serving event loop."""
+    global _feed
+    if _feed is None or _feed.loop is not asyncio.get_running_loop():
+        settings = get_settings()
+        _feed = ChangeFeed(settings.change_feed_poll_interval, settings.change_feed_buffer_size)
+    return _feed
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,9 +7,36 @@ class Settings(BaseSettings):
     grok_api_key: str = ""
     grok_model: str = "grok-voice"
     grok_realtime_url: str = "wss://api.x.ai/v1/realtime"
+    grok_transcription_model: str = ""
     database_url: str = "sqlite:///./itsd.db"
+    serve_host: str = "0.0.0.0"
+    serve_port: int = 8000
+    serve_workers: int = 1
+    bootstrap_lock_path: str = "./.itsd-bootstrap.lock"
+    rate_limit_enabled: bool = True
+    rate_limit_client_per_sec: float = 10.0
+    rate_limit_client_burst: float = 20.0
+    rate_limit_tool_per_sec: float = 2.0
+    rate_limit_tool_burst: float = 5.0
+    rate_limit_prefetch_per_sec: float = 5.0
+    rate_limit_prefetch_burst: float = 10.0
+    max_concurrent_requests: int = 64
+    voice_reserved_slots: int = 16
+    change_feed_poll_interval: float = 0.5
+    change_feed_keepalive: float = 15.0
+    change_feed_buffer_size: int = 1000
+    change_feed_max_streams: int = 500
+    archive_after_days: int = 90
+    archive_batch_size: int = 500
+    prefetch_enabled: bool = True
+    prefetch_workers: int = 4
+    prefetch_term_limit: int = 50
+    prefetch_wait_timeout: float = 1.0
+    prefetch_session_ttl: float = 300.0
 
     model_config = SettingsConfigDict(env_file=".env", env_prefix="", case_sensitive=False)
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, create_engine
+from sqlalchemy import DateTime, Engine, ForeignKey, Integer, String, Text, create_engine, event, inspect, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship, sessionmaker
 
-from .config import settings
+from .config import get_settings
+from .snippets import build_snippets, content_hash
 
 
 class Base(DeclarativeBase):
@@ -21,11 +23,24 @@ class KnowledgeArticle(Base):
     content: Mapped[str] = mapped_column(Text, nullable=False)
     tags: Mapped[str] = mapped_column(String(255), nullable=False, default="")
     source: Mapped[str] = mapped_column(String(255), nullable=False, default="manual")
+    spoken_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    spoken_steps: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    def refresh_snippets(self) -> bool:
+        """Recompute the spoken fields if title or content changed since the last build."""
+        if self.content_hash and self.content_hash == content_hash(self.title, self.content):
+            return False
+        for key, value in build_snippets(self.title, self.content).items():
+            setattr(self, key, value)
+        return True
+
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    # Never reuse ids of archived rows: numeric ticket refs and change-feed cursors rely on them.
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     ticket_number: Mapped[str] = mapped_column(String(32), nullable=False, unique=True, index=True)
@@ -44,6 +59,7 @@ class Ticket(Base):
 
 class TicketUpdate(Base):
     __tablename__ = "ticket_updates"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     ticket_id: Mapped[int] = mapped_column(ForeignKey("tickets.id"), nullable=False, index=True)
@@ -55,9 +71,82 @@ class TicketUpdate(Base):
     ticket: Mapped[Ticket] = relationship(back_populates="updates")
 
 
-engine = create_engine(settings.database_url, future=True)
-SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
+class ArchivedTicket(Base):
+    __tablename__ = "archived_tickets"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    ticket_number: Mapped[str] = mapped_column(String(32), nullable=False, unique=True, index=True)
+    requester_name: Mapped[str] = mapped_column(String(120), nullable=False)
+    requester_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(40), nullable=False)
+    priority: Mapped[str] = mapped_column(String(20), nullable=False)
+    assigned_group: Mapped[str] = mapped_column(String(120), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    updates: Mapped[list[ArchivedTicketUpdate]] = relationship(
+        back_populates="ticket", cascade="all, delete-orphan"
+    )
+
+
+class ArchivedTicketUpdate(Base):
+    __tablename__ = "archived_ticket_updates"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    ticket_id: Mapped[int] = mapped_column(ForeignKey("archived_tickets.id"), nullable=False, index=True)
+    author: Mapped[str] = mapped_column(String(120), nullable=False)
+    comment: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(40), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+
+    ticket: Mapped[ArchivedTicket] = relationship(back_populates="updates")
+
+
+@event.listens_for(KnowledgeArticle, "before_insert")
+@event.listens_for(KnowledgeArticle, "before_update")
+def _knowledge_snippets_listener(mapper, connection, target: KnowledgeArticle) -> None:
+    target.refresh_snippets()
+
+
+# Columns added after the initial schema; create_all does not alter existing tables.
+ADDED_COLUMNS = {
+    "knowledge_articles": {
+        "spoken_summary": "TEXT",
+        "spoken_steps": "TEXT",
+        "content_hash": "VARCHAR(64)",
+    },
+}
+
+
+@lru_cache
+def get_engine() -> Engine:
+    return create_engine(get_settings().database_url, future=True)
+
+
+@lru_cache
+def _session_factory() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_engine(), class_=Session, expire_on_commit=False)
+
+
+def SessionLocal() -> Session:
+    """Open a session, creating the engine on first use rather than at import time."""
+    return _session_factory()()
 
 
 def init_db() -> None:
-    Base.metadata.create_all(engine)
+    Base.metadata.create_all(get_engine())
+    _add_missing_columns()
+
+
+def _add_missing_columns() -> None:
+    engine = get_engine()
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
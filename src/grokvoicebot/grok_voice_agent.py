@@ -4,12 +4,13 @@ import asyncio
 import json
 import logging
 from typing import Any
+import uuid
 
 import websockets
 
-from .config import settings
-from .schemas import KnowledgeSearchInput, TicketCreateInput, TicketStatusInput, TicketUpdateInput
-from .services import create_ticket, get_ticket_status, search_knowledge, update_ticket
+from .config import get_settings
+from .prefetch import get_prefetcher
+from .ratelimit import get_admission
 
 logger = logging.getLogger(__name__)
 
@@ -88,9 +89,44 @@ def _extract_tool_call(message: dict[str, Any]) -> tuple[str, str, dict[str, Any
     return None
 
 
-def _execute_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
+TRANSCRIPTION_EVENT_PREFIX = "conversation.item.input_audio_transcription."
+
+
+def _accumulate_transcript(message: dict[str, Any], partials: dict[str, str]) -> str | None:
+    """Return the caller's transcript so far for transcription delta/completed events."""
+    event_type = str(message.get("type", ""))
+    if not event_type.startswith(TRANSCRIPTION_EVENT_PREFIX):
+        return None
+    item_id = str(message.get("item_id", ""))
+    if event_type.endswith(".delta"):
+        partials[item_id] = partials.get(item_id, "") + str(message.get("delta", ""))
+        return partials[item_id]
+    if event_type.endswith(".completed"):
+        partials.pop(item_id, None)
+        return message.get("transcript")
+    return None
+
+
+def _load_tool_backend() -> None:
+    # schemas pulls in pydantic/email-validator and services the SQLAlchemy stack; these are
+    # only needed once a tool call arrives, so they are imported off the connect path.
+    from . import schemas, services  # noqa: F401
+
+
+def _execute_tool(name: str, args: dict[str, Any], session_id: str | None = None) -> dict[str, Any]:
+    from .schemas import KnowledgeSearchInput, TicketCreateInput, TicketStatusInput, TicketUpdateInput
+    from .services import create_ticket, get_ticket_status, search_knowledge, update_ticket
+
+    if get_settings().rate_limit_enabled:
+        retry_after = get_admission().check_tool(name)
+        if retry_after:
+            return {"error": f"Tool {name} is rate limited, retry shortly", "retry_after": round(retry_after, 2)}
     if name == "search_knowledge":
         data = KnowledgeSearchInput.model_validate(args)
+        if session_id and get_settings().prefetch_enabled:
+            prefetched = get_prefetcher().lookup(session_id, data.query)
+            if prefetched is not None:
+                return prefetched
         return search_knowledge(data.query)
     if name == "create_ticket":
         data = TicketCreateInput.model_validate(args)
@@ -105,9 +141,16 @@ def _execute_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
 
 
 async def run_voice_agent() -> None:
+    settings = get_settings()
     if not settings.grok_api_key:
         raise RuntimeError("Set GROK_API_KEY in environment.")
 
+    # Warm the tool backend imports while the websocket handshake is in flight.
+    backend_ready = asyncio.create_task(asyncio.to_thread(_load_tool_backend))
+
+    session_id = uuid.uuid4().hex
+    partial_transcripts: dict[str, str] = {}
+
     headers = {
         "Authorization": f"Bearer {settings.grok_api_key}",
     }
@@ -125,6 +168,10 @@ async def run_voice_agent() -> None:
                 "tools": TOOLS,
             },
         }
+        if settings.prefetch_enabled:
+            # Transcription events of the caller's audio drive the speculative knowledge prefetch.
+            transcription = {"model": settings.grok_transcription_model} if settings.grok_transcription_model else {}
+            session_update["session"]["input_audio_transcription"] = transcription
         await ws.send(json.dumps(session_update))
 
         async for raw in ws:
@@ -135,13 +182,20 @@ async def run_voice_agent() -> None:
                 continue
 
             logger.debug("Incoming realtime event: %s", message)
+            transcript = _accumulate_transcript(message, partial_transcripts)
+            if transcript is not None:
+                if settings.prefetch_enabled:
+                    get_prefetcher().observe(session_id, transcript)
+                continue
+
             extracted = _extract_tool_call(message)
             if not extracted:
                 continue
 
             call_id, name, args = extracted
             try:
-                result = _execute_tool(name, args)
+                await backend_ready
+                result = _execute_tool(name, args, session_id)
             except Exception as exc:  # safe return to realtime loop
                 logger.exception("Tool execution failed")
                 result = {"error": str(exc)}
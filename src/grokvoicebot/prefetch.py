@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+import os
+import re
+import threading
+import time
+
+from .config import get_settings
+
+
+# Mirrors the page size of search_knowledge.
+ANSWER_LIMIT = 5
+MAX_TERMS_PER_SESSION = 6
+MIN_TERM_LENGTH = 3
+
+_TERM_RE = re.compile(r"[a-z0-9]+")
+_SEARCHED_FIELDS = ("title", "content", "tags", "category")
+STOPWORDS = frozenset(
+    """
+    about after again all also and any are because been but can cannot cant could did does doesnt
+    dont for from get getting got had has have help how into issue its just keeps like need not
+    now please problem some still that the their them then there this was what when where which
+    why will with won wont work working would you your
+    """.split()
+)
+
+
+def query_terms(text: str) -> list[str]:
+    """Salient words of a transcript or query, in order, without duplicates."""
+    terms = []
+    for word in _TERM_RE.findall(text.lower()):
+        if len(word) >= MIN_TERM_LENGTH and word not in STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms
+
+
+def _search(term: str, limit: int) -> dict:
+    from .services import search_knowledge
+
+    return search_knowledge(term, limit=limit)
+
+
+def _answer_from(result: dict, query: str) -> dict:
+    """Re-run search_knowledge's substring match for `query` over a complete term result."""
+    needle = query.lower()
+    matches = [m for m in result["matches"] if any(needle in (m.get(f) or "").lower() for f in _SEARCHED_FIELDS)]
+    return {"query": query, "matches": matches[:ANSWER_LIMIT]}
+
+
+class KnowledgePrefetcher:
+    """Speculatively searches knowledge for the salient terms of a caller's interim transcript.
+
+    search_knowledge is a substring match on the whole query, so a query containing a term
+    can only match articles that also match the term alone. When the term search returned
+    fewer than `term_limit` rows it is complete, and any later query containing the term -
+    the caller's final utterance or a query Grok rephrased - is answered by filtering it in
+    memory with the same match. Terms that drop out of a newer transcript are cancelled.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        term_limit: int,
+        wait_timeout: float,
+        session_ttl: float,
+        search: Callable[[str, int], dict] = _search,
+    ) -> None:
+        self.workers = workers
+        self.term_limit = term_limit
+        self.wait_timeout = wait_timeout
+        self.session_ttl = session_ttl
+        self.search = search
+        self.counters: Counter[str] = Counter()
+        self._sessions: dict[str, tuple[dict[str, Future], float]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="knowledge-prefetch")
+        return self._executor
+
+    def _cancel(self, futures) -> None:
+        for future in futures:
+            if future.cancel():
+                self.counters["cancelled"] += 1
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [sid for sid, (_, seen) in self._sessions.items() if now - seen > self.session_ttl]
+        for sid in expired:
+            self._cancel(self._sessions.pop(sid)[0].values())
+
+    def observe(self, session_id: str, transcript: str) -> bool:
+        """Keep speculative searches running for the latest transcript's terms only."""
+        terms = query_terms(transcript)[-MAX_TERMS_PER_SESSION:]
+        if not terms:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            current = self._sessions.get(session_id, ({}, now))[0]
+            self._cancel(f for t, f in current.items() if t not in terms)
+            futures = {}
+            for term in terms:
+                futures[term] = current.get(term) or self._pool().submit(self.search, term, self.term_limit)
+                if term not in current:
+                    self.counters["speculated"] += 1
+            self._sessions[session_id] = (futures, now)
+        return True
+
+    def lookup(self, session_id: str, query: str) -> dict | None:
+        """Answer `query` from a complete speculative term result, or return None on a miss."""
+        with self._lock:
+            futures = self._sessions.get(session_id, ({}, 0.0))[0]
+            candidates = [futures[t] for t in query_terms(query) if t in futures]
+        if "%" in query or "_" in query:
+            candidates = []  # LIKE wildcards cannot be replayed in memory
+        # Prefer finished searches; only wait while something overlapping is still running.
+        candidates.sort(key=lambda f: not f.done())
+        deadline = time.monotonic() + self.wait_timeout
+        outcome = "misses"
+        answer = None
+        for future in candidates:
+            try:
+                result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                outcome = "timeouts"
+                break
+            except Exception:
+                continue
+            if len(result["matches"]) < self.term_limit:
+                answer = _answer_from(result, query)
+                outcome = "hits"
+                break
+        with self._lock:
+            self.counters[outcome] += 1
+        return answer
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {k: self.counters[k] for k in ("speculated", "cancelled", "hits", "misses", "timeouts")}
+            lookups = counts["hits"] + counts["misses"] + counts["timeouts"]
+            return {
+                "scope": "worker",
+                "pid": os.getpid(),
+                **counts,
+                "hit_rate": round(counts["hits"] / lookups, 3) if lookups else None,
+                "active_sessions": len(self._sessions),
+            }
+
+
+@lru_cache
+def get_prefetcher() -> KnowledgePrefetcher:
+    settings = get_settings()
+    return KnowledgePrefetcher(
+        workers=settings.prefetch_workers,
+        term_limit=settings.prefetch_term_limit,
+        wait_timeout=settings.prefetch_wait_timeout,
+        session_ttl=settings.prefetch_session_ttl,
+    )
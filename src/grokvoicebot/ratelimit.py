@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from functools import lru_cache
+import os
+import threading
+import time
+
+from .config import get_settings
+
+
+VOICE_LANE = "voice"
+DEFAULT_LANE = "default"
+
+MAX_TRACKED_KEYS = 10_000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consume one token; return 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+
+class AdmissionController:
+    """Token buckets per client and per tool, plus a concurrency cap with a reserved voice lane."""
+
+    def __init__(
+        self,
+        client_rate: float,
+        client_burst: float,
+        tool_rate: float,
+        tool_burst: float,
+        prefetch_rate: float,
+        prefetch_burst: float,
+        max_concurrency: int,
+        voice_reserved_slots: int,
+        workers: int = 1,
+    ) -> None:
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.tool_rate = tool_rate
+        self.tool_burst = tool_burst
+        self.prefetch_rate = prefetch_rate
+        self.prefetch_burst = prefetch_burst
+        self.max_concurrency = max_concurrency
+        self.voice_reserved_slots = min(voice_reserved_slots, max_concurrency)
+        self.workers = workers
+        self.in_flight = 0
+        self.admitted: Counter[str] = Counter()
+        self.shed: Counter[str] = Counter()
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str, rate: float, burst: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+            if len(self._buckets) > MAX_TRACKED_KEYS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def check_client(self, client: str) -> float:
+        with self._lock:
+            retry_after = self._bucket(f"client:{client}", self.client_rate, self.client_burst).take()
+            if retry_after:
+                self.shed["client_rate"] += 1
+            return retry_after
+
+    def check_prefetch(self, client: str) -> float:
+        """Speculative prefetches have their own bucket so they never spend a client's request budget."""
+        with self._lock:
+            retry_after = self._bucket(f"prefetch:{client}", self.prefetch_rate, self.prefetch_burst).take()
+            if retry_after:
+                self.shed["prefetch_rate"] += 1
+            return retry_after
+
+    def check_tool(self, name: str) -> float:
+        with self._lock:
+            retry_after = self._bucket(f"tool:{name}", self.tool_rate, self.tool_burst).take()
+            if retry_after:
+                self.shed["tool_rate"] += 1
+            return retry_after
+
+    def acquire(self, lane: str) -> bool:
+        """Claim a concurrency slot without waiting; the default lane cannot use voice-reserved slots."""
+        limit = self.max_concurrency
+        if lane != VOICE_LANE:
+            limit -= self.voice_reserved_slots
+        with self._lock:
+            if self.in_flight >= limit:
+                self.shed[f"concurrency:{lane}"] += 1
+                return False
+            self.in_flight += 1
+            self.admitted[lane] += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "scope": "worker",
+                "pid": os.getpid(),
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "voice_reserved_slots": self.voice_reserved_slots,
+                "admitted": dict(self.admitted),
+                "shed": dict(self.shed),
+                "shed_total": sum(self.shed.values()),
+            }
+
+
+@lru_cache
+def get_admission() -> AdmissionController:
+    settings = get_settings()
+    # The concurrency total is split evenly across API workers. Per-client buckets are not:
+    # a keep-alive connection stays on one worker, so a split bucket would give a single
+    # client only a fraction of its limit. Tool limits apply to the single realtime agent.
+    workers = max(1, settings.serve_workers)
+    max_concurrency = max(1, settings.max_concurrent_requests // workers)
+    reserved = settings.voice_reserved_slots
+    if reserved:
+        # Keep at least one slot per worker open to the default lane.
+        reserved = min(max(1, reserved // workers), max_concurrency - 1)
+    return AdmissionController(
+        client_rate=settings.rate_limit_client_per_sec,
+        client_burst=settings.rate_limit_client_burst,
+        tool_rate=settings.rate_limit_tool_per_sec,
+        tool_burst=settings.rate_limit_tool_burst,
+        prefetch_rate=settings.rate_limit_prefetch_per_sec,
+        prefetch_burst=settings.rate_limit_prefetch_burst,
+        max_concurrency=max_concurrency,
+        voice_reserved_slots=reserved,
+        workers=workers,
+    )
@@ -35,3 +35,9 @@ class TicketUpdateInput(BaseModel):
 
 class AssistantUtteranceInput(BaseModel):
     utterance: str = Field(min_length=2)
+    session_id: str | None = None
+
+
+class TranscriptPrefetchInput(BaseModel):
+    session_id: str = Field(min_length=1)
+    transcript: str
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, bootstrap runs unlocked
+    fcntl = None
+
+from .config import get_settings
+from .db import init_db
+from .services import refresh_knowledge_snippets, seed_knowledge
+
+logger = logging.getLogger(__name__)
+
+# Set by the serve entry point so forked/spawned workers skip startup work.
+BOOTSTRAPPED_ENV = "ITSD_BOOTSTRAPPED"
+
+
+def _bootstrap_unlocked() -> None:
+    init_db()
+    seed_knowledge()
+    refresh_knowledge_snippets()
+
+
+def bootstrap() -> None:
+    """Run schema and seed work, serialized across processes by a file lock where available."""
+    if fcntl is None:
+        _bootstrap_unlocked()
+        return
+    with open(get_settings().bootstrap_lock_path, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            _bootstrap_unlocked()
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def is_bootstrapped() -> bool:
+    return os.environ.get(BOOTSTRAPPED_ENV) == "1"
+
+
+def main() -> None:
+    import uvicorn
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the ITSD voicebot API with multiple workers.")
+    parser.add_argument("--host", default=settings.serve_host)
+    parser.add_argument("--port", type=int, default=settings.serve_port)
+    parser.add_argument("--workers", type=int, default=settings.serve_workers)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    bootstrap()
+    os.environ[BOOTSTRAPPED_ENV] = "1"
+    # Workers read this through Settings to split the deployment-wide rate limits.
+    os.environ["SERVE_WORKERS"] = str(args.workers)
+    logger.info("Bootstrap complete, starting %d worker(s)", args.workers)
+    uvicorn.run("grokvoicebot.api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,10 @@ from __future__ import annotations
 from datetime import datetime
 import re
 
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select
 
-from .db import KnowledgeArticle, SessionLocal, Ticket, TicketUpdate
+from .archive import find_archived_ticket, restore_ticket
+from .db import ArchivedTicket, KnowledgeArticle, SessionLocal, Ticket, TicketUpdate
 
 
 TICKET_PREFIX = "ITSD"
@@ -31,10 +32,23 @@ def _next_ticket_number(session) -> str:
     return f"{prefix}{seq:04d}"
 
 
-def _find_ticket(session, ticket_ref: str) -> Ticket | None:
+def _find_ticket(session, ticket_ref: str) -> Ticket | ArchivedTicket | None:
     if re.fullmatch(r"\d+", ticket_ref):
-        return session.get(Ticket, int(ticket_ref))
-    return session.scalar(select(Ticket).where(Ticket.ticket_number == ticket_ref))
+        ticket = session.get(Ticket, int(ticket_ref))
+    else:
+        ticket = session.scalar(select(Ticket).where(Ticket.ticket_number == ticket_ref))
+    return ticket or find_archived_ticket(session, ticket_ref)
+
+
+def refresh_knowledge_snippets() -> dict:
+    """Backfill spoken snippets for articles that predate them or changed outside the ORM."""
+    refreshed = 0
+    with SessionLocal() as session:
+        for row in session.scalars(select(KnowledgeArticle)):
+            if row.refresh_snippets():
+                refreshed += 1
+        session.commit()
+    return {"refreshed": refreshed}
 
 
 def seed_knowledge() -> None:
@@ -196,7 +210,7 @@ def create_knowledge_article(title: str, category: str, content: str, tags: str
         }
 
 
-def search_knowledge(query: str) -> dict:
+def search_knowledge(query: str, limit: int = 5) -> dict:
     q = f"%{query.lower()}%"
     with SessionLocal() as session:
         rows = session.scalars(
@@ -208,7 +222,8 @@ def search_knowledge(query: str) -> dict:
                     KnowledgeArticle.category.ilike(q),
                 )
             )
-            .limit(5)
+            .order_by(KnowledgeArticle.id)
+            .limit(limit)
         ).all()
 
         return {
@@ -219,6 +234,9 @@ def search_knowledge(query: str) -> dict:
                     "title": r.title,
                     "category": r.category,
                     "content": r.content,
+                    "tags": r.tags,
+                    "spoken_summary": r.spoken_summary,
+                    "spoken_steps": r.spoken_steps.splitlines() if r.spoken_steps else [],
                     "source": r.source,
                 }
                 for r in rows
@@ -320,6 +338,8 @@ def update_ticket(ticket_ref: str, comment: str, status: str, author: str = "voi
         ticket = _find_ticket(session, ticket_ref)
         if not ticket:
             return {"error": f"Ticket {ticket_ref} not found"}
+        if isinstance(ticket, ArchivedTicket):
+            ticket = restore_ticket(session, ticket)
 
         ticket.status = status
         update = TicketUpdate(ticket_id=ticket.id, author=author, comment=comment, status=status)
@@ -331,3 +351,54 @@ def update_ticket(ticket_ref: str, comment: str, status: str, author: str = "voi
             "status": ticket.status,
             "last_comment": comment,
         }
+
+
+def latest_change_cursor() -> int:
+    with SessionLocal() as session:
+        return session.scalar(select(func.max(TicketUpdate.id))) or 0
+
+
+def list_ticket_changes(
+    cursor: int = 0,
+    ticket_ref: str | None = None,
+    assigned_group: str | None = None,
+    status: str | None = None,
+    limit: int = 100,
+) -> dict:
+    """Return ticket updates after `cursor` in insertion order; pass back `cursor` to resume."""
+    with SessionLocal() as session:
+        stmt = (
+            select(TicketUpdate, Ticket)
+            .join(Ticket, TicketUpdate.ticket_id == Ticket.id)
+            .where(TicketUpdate.id > cursor)
+            .order_by(TicketUpdate.id)
+            .limit(limit)
+        )
+        if ticket_ref:
+            ticket = _find_ticket(session, ticket_ref)
+            if not ticket:
+                return {"error": f"Ticket {ticket_ref} not found"}
+            stmt = stmt.where(TicketUpdate.ticket_id == ticket.id)
+        if assigned_group:
+            stmt = stmt.where(Ticket.assigned_group == assigned_group)
+        if status:
+            stmt = stmt.where(TicketUpdate.status == status)
+
+        changes = [
+            {
+                "cursor": u.id,
+                "ticket_id": t.id,
+                "ticket_number": t.ticket_number,
+                "status": u.status,
+                "author": u.author,
+                "comment": u.comment,
+                "priority": t.priority,
+                "assigned_group": t.assigned_group,
+                "created_at": u.created_at.isoformat() if u.created_at else None,
+            }
+            for u, t in session.execute(stmt)
+        ]
+        return {
+            "changes": changes,
+            "cursor": changes[-1]["cursor"] if changes else cursor,
+        }
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import re
+
+
+# Bump when the extraction rules change so stored snippets are rebuilt on the next refresh.
+SNIPPET_VERSION = 2
+SUMMARY_MAX_WORDS = 30
+MAX_STEPS = 6
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_LIST_MARKER_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_INLINE_MARKER_RE = re.compile(r"(?:^|\s)\d+[.)]\s+")
+_SERIAL_LIST_RE = re.compile(r",\s+(?:and|then)\s+", re.IGNORECASE)
+_CLAUSE_SPLIT_RE = re.compile(r",\s*(?:(?:and|then)\s+)?", re.IGNORECASE)
+_LEADING_JOINER_RE = re.compile(r"^(?:and|then|also)\s+", re.IGNORECASE)
+# Clauses starting like this depend on their neighbour and are not steps on their own.
+_DEPENDENT_CLAUSE_RE = re.compile(
+    r"^(?:if|when|unless|otherwise|once|after|before|while|because|although)\b", re.IGNORECASE
+)
+
+
+def content_hash(title: str, content: str) -> str:
+    return hashlib.sha256(f"{SNIPPET_VERSION}\n{title}\n{content}".encode("utf-8")).hexdigest()
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _lines(content: str) -> list[str]:
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def _split_clauses(sentence: str) -> list[str]:
+    """Split a sentence into steps only when it is a serial list ("a, b, and c")."""
+    clauses = []
+    for part in re.split(r"\s*;\s*", sentence):
+        if _SERIAL_LIST_RE.search(part):
+            pieces = _CLAUSE_SPLIT_RE.split(part)
+            if not any(_DEPENDENT_CLAUSE_RE.match(p.strip()) for p in pieces):
+                clauses.extend(pieces)
+                continue
+        clauses.append(part)
+    return clauses
+
+
+def _step_candidates(content: str) -> list[str]:
+    lines = _lines(content)
+    if len(lines) == 1 and len(_INLINE_MARKER_RE.findall(content)) > 1:
+        return _INLINE_MARKER_RE.split(content)
+    marked = [line for line in lines if _LIST_MARKER_RE.match(line)]
+    if marked:
+        return [_LIST_MARKER_RE.sub("", line) for line in marked]
+    if len(lines) > 1:
+        return lines
+    return [c for sentence in _SENTENCE_RE.split(_clean(content)) for c in _split_clauses(sentence)]
+
+
+def extract_steps(content: str) -> list[str]:
+    steps = []
+    for part in _step_candidates(content):
+        part = _LEADING_JOINER_RE.sub("", _clean(part)).strip(" .")
+        if part:
+            steps.append(part[0].upper() + part[1:])
+        if len(steps) == MAX_STEPS:
+            break
+    return steps
+
+
+def summarize_for_speech(content: str) -> str:
+    """First sentence of the article's intro; empty when the article is only a numbered list."""
+    lines = _lines(content)
+    if any(_LIST_MARKER_RE.match(line) for line in lines):
+        intro = []
+        for line in lines:
+            if _LIST_MARKER_RE.match(line):
+                break
+            intro.append(line)
+        text = _clean(" ".join(intro))
+    else:
+        text = _clean(content)
+    if _INLINE_MARKER_RE.match(text):
+        return ""
+    first = _SENTENCE_RE.split(text, maxsplit=1)[0] if text else ""
+    words = first.split()
+    if len(words) > SUMMARY_MAX_WORDS:
+        first = " ".join(words[:SUMMARY_MAX_WORDS]).rstrip(",;:") + "..."
+    elif first and first[-1] not in ".!?":
+        first += "."
+    return first
+
+
+def build_snippets(title: str, content: str) -> dict:
+    """Return the precomputed spoken fields stored on a knowledge article."""
+    return {
+        "spoken_summary": summarize_for_speech(content),
+        "spoken_steps": "\n".join(extract_steps(content)),
+        "content_hash": content_hash(title, content),
+    }
@@ -0,0 +1,65 @@
+"""Measure cold import time of the voicebot entry points and enforce a budget.
+
+Usage: python -m grokvoicebot.startup_bench [--budget-ms N] [--top 10]
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+
+# (statement, budget in ms). Budgets include interpreter startup. db_init needs SQLAlchemy
+# to create the schema at all, so it gets a larger budget than the voice agent, which
+# defers the database stack until after connecting.
+TARGETS = {
+    "voice_agent": ("import grokvoicebot.grok_voice_agent", 400.0),
+    "db_init": ("import grokvoicebot.__main__", 900.0),
+}
+
+
+def profile_imports(statement: str) -> tuple[float, list[tuple[float, str]]]:
+    """Run `statement` in a fresh interpreter and return (total ms, [(cumulative ms, module)])."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative_us = int(cumulative)
+        # Top-level imports have no indentation; their cumulative times sum to the total.
+        if not name.startswith("  "):
+            total_us += cumulative_us
+        modules.append((cumulative_us / 1000, name.strip()))
+    modules.sort(reverse=True)
+    return total_us / 1000, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=None, help="override every target's budget")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    over_budget = []
+    for label, (statement, budget_ms) in TARGETS.items():
+        budget_ms = args.budget_ms if args.budget_ms is not None else budget_ms
+        total_ms, modules = profile_imports(statement)
+        print(f"{label}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+        for cumulative_ms, name in modules[: args.top]:
+            print(f"  {cumulative_ms:8.1f} ms  {name}")
+        if total_ms > budget_ms:
+            over_budget.append(label)
+
+    if over_budget:
+        sys.exit(f"Startup budget exceeded: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
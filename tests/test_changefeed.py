@@ -0,0 +1,77 @@
+import asyncio
+
+from grokvoicebot import changefeed
+from grokvoicebot.changefeed import ChangeFeed
+
+
+class FakeUpdates:
+    def __init__(self):
+        self.rows = []
+
+    def insert(self, ticket_number="ITSD-1", status="open"):
+        cursor = len(self.rows) + 1
+        self.rows.append({"cursor": cursor, "ticket_id": 1, "ticket_number": ticket_number, "status": status})
+
+    def list_ticket_changes(self, cursor=0, ticket_ref=None, assigned_group=None, status=None, limit=100):
+        changes = [r for r in self.rows if r["cursor"] > cursor][:limit]
+        return {"changes": changes, "cursor": changes[-1]["cursor"] if changes else cursor}
+
+
+def run_feed(monkeypatch, scenario, buffer_size=100):
+    updates = FakeUpdates()
+    monkeypatch.setattr(changefeed, "list_ticket_changes", updates.list_ticket_changes)
+    monkeypatch.setattr(changefeed, "latest_change_cursor", lambda: 0)
+
+    async def main():
+        feed = ChangeFeed(poll_interval=0.01, buffer_size=buffer_size)
+        assert feed.reserve(10)
+        try:
+            return await scenario(feed, updates)
+        finally:
+            feed.release()
+            feed._task.cancel()
+
+    return asyncio.run(main())
+
+
+async def consume(feed, count, delay=0.0, position=0, matches=lambda change: True):
+    received = []
+    async for change in feed.stream(position, matches, keepalive=1.0):
+        if change is None:
+            continue
+        received.append(change["cursor"])
+        if len(received) == count:
+            return received
+        await asyncio.sleep(delay)
+
+
+def test_slow_subscriber_receives_every_change(monkeypatch):
+    async def scenario(feed, updates):
+        consumer = asyncio.create_task(consume(feed, 10, delay=0.05))
+        for _ in range(10):
+            updates.insert()
+            await asyncio.sleep(0.01)
+        return await asyncio.wait_for(consumer, 5)
+
+    assert run_feed(monkeypatch, scenario) == list(range(1, 11))
+
+
+def test_subscriber_behind_evicted_buffer_catches_up(monkeypatch):
+    async def scenario(feed, updates):
+        consumer = asyncio.create_task(consume(feed, 10, delay=0.05))
+        for _ in range(10):
+            updates.insert()
+            await asyncio.sleep(0.01)
+        return await asyncio.wait_for(consumer, 5)
+
+    assert run_feed(monkeypatch, scenario, buffer_size=3) == list(range(1, 11))
+
+
+def test_filtered_subscriber_only_gets_matching_changes(monkeypatch):
+    async def scenario(feed, updates):
+        consumer = asyncio.create_task(consume(feed, 2, matches=lambda change: change["status"] == "resolved"))
+        for status in ("open", "resolved", "in_progress", "resolved"):
+            updates.insert(status=status)
+        return await asyncio.wait_for(consumer, 5)
+
+    assert run_feed(monkeypatch, scenario) == [2, 4]
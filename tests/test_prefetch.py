@@ -0,0 +1,74 @@
+import threading
+import time
+
+from grokvoicebot.prefetch import KnowledgePrefetcher, query_terms
+
+
+ARTICLES = [
+    {"id": 1, "title": "VPN not connecting", "category": "network", "content": "Re-enter VPN profile.", "tags": "vpn"},
+    {"id": 2, "title": "VPN slow", "category": "network", "content": "Check split tunnel.", "tags": "vpn,remote"},
+]
+
+
+def fake_search(term, limit):
+    matches = [a for a in ARTICLES if any(term in (a[f] or "").lower() for f in ("title", "content", "tags", "category"))]
+    return {"query": term, "matches": matches[:limit]}
+
+
+def make(search=fake_search, workers=2, term_limit=50, wait_timeout=1.0):
+    return KnowledgePrefetcher(workers=workers, term_limit=term_limit, wait_timeout=wait_timeout, session_ttl=60, search=search)
+
+
+def test_query_terms_drops_stopwords_and_short_words():
+    assert query_terms("My VPN is not connecting, vpn again") == ["vpn", "connecting"]
+
+
+def test_hit_for_rephrased_query_matches_direct_search():
+    prefetcher = make()
+    prefetcher.observe("s1", "um my vpn keeps dropping")
+
+    result = prefetcher.lookup("s1", "VPN not connecting")
+
+    assert result == {"query": "VPN not connecting", "matches": [ARTICLES[0]]}
+    assert prefetcher.stats()["hits"] == 1
+
+
+def test_miss_without_overlapping_term_does_not_wait():
+    release = threading.Event()
+    prefetcher = make(search=lambda term, limit: release.wait() and fake_search(term, limit), wait_timeout=5)
+    prefetcher.observe("s1", "printer offline")
+
+    started = time.monotonic()
+    assert prefetcher.lookup("s1", "vpn") is None
+    assert time.monotonic() - started < 0.5
+    assert prefetcher.stats()["misses"] == 1
+    release.set()
+
+
+def test_miss_when_term_result_was_truncated():
+    prefetcher = make(term_limit=2)
+    prefetcher.observe("s1", "vpn")
+
+    assert prefetcher.lookup("s1", "vpn slow") is None
+    assert prefetcher.stats()["misses"] == 1
+
+
+def test_changed_transcript_cancels_pending_terms():
+    release = threading.Event()
+    prefetcher = make(search=lambda term, limit: release.wait() and fake_search(term, limit), workers=1)
+    prefetcher.observe("s1", "printer spooler")  # "printer" occupies the only worker, "spooler" is queued
+    prefetcher.observe("s1", "vpn")
+
+    assert prefetcher.stats()["cancelled"] == 1
+    release.set()
+    assert prefetcher.lookup("s1", "vpn") is not None
+
+
+def test_timeout_when_overlapping_search_is_still_running():
+    release = threading.Event()
+    prefetcher = make(search=lambda term, limit: release.wait() and fake_search(term, limit), wait_timeout=0.05)
+    prefetcher.observe("s1", "vpn")
+
+    assert prefetcher.lookup("s1", "vpn") is None
+    assert prefetcher.stats()["timeouts"] == 1
+    release.set()